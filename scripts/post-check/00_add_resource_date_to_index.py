@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""Post-check script: add resource dates to the generated index page.
+
+Reads the StructureDefinition index that the IG Publisher emits under
+temp/pages/_data/structuredefinitions.json and exposes the (name, date)
+pairs needed to decorate the rendered index page.
+"""
+
+import functools
+import gc
+import html
+import mmap
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json exposes a compatible loads()
+    import json as orjson  # type: ignore[no-redef]
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; without it we fall back to a full parse
+    ijson = None
+else:
+    try:
+        # Native tokenizer when available; under PyPy the pure-python
+        # backend is preferable and ijson picks it automatically.
+        ijson = ijson.get_backend("yajl2_c")
+    except ImportError:
+        pass
+
+# Relative location of the publisher's SD index, joined once at import so
+# per-call path building is a single string concat instead of a chain of
+# intermediate Path objects.
+_SD_REL = os.path.join("temp", "pages", "_data", "structuredefinitions.json")
+
+# Messages are buffered and flushed once at main() exit: stdout is
+# line-buffered under CI log collectors, so per-print flushes would cost
+# one syscall each.
+_LOG: list = []
+
+
+def _log(message: str) -> None:
+    _LOG.append(message)
+
+
+def _flush_log() -> None:
+    if _LOG:
+        sys.stdout.write("\n".join(_LOG) + "\n")
+        sys.stdout.flush()
+        _LOG.clear()
+
+
+class SDRecord(NamedTuple):
+    """One StructureDefinition index entry.
+
+    A NamedTuple costs ~64 bytes per record versus ~232 for a dict, and
+    downstream attribute access (rec.name) is a LOAD_ATTR rather than a
+    hashed subscript.
+    """
+
+    name: str
+    date: str
+
+
+try:
+    from _sd_index import extract_sd  # compiled twin, see _sd_index.pyx
+except ImportError:
+    def extract_sd(data: dict, record=SDRecord) -> list:
+        """Pure-Python fallback for the compiled extraction loop."""
+        # The index is produced by the IG Publisher with a known shape:
+        # every top-level value is an object. Sanity-check once instead of
+        # paying an isinstance call per record.
+        assert not data or isinstance(
+            next(iter(data.values())), dict
+        ), "unexpected SD index shape"
+        # A comprehension compiles to the specialized LIST_APPEND opcode
+        # and pre-sizes from the dict's length hint. Dates are interned:
+        # one publisher run stamps most SDs with the same date, so K
+        # distinct strings back N records.
+        _intern = sys.intern
+        return [
+            record(v.get("name", k), _intern(v.get("date", "N/A")))
+            for k, v in data.items()
+        ]
+
+
+def _loads_mapped(f):
+    """Parse an open binary file with orjson, zero-copy via mmap when possible.
+
+    Mapping the file lets the parser read straight from the page cache
+    instead of first copying the whole file into a bytes object. Empty
+    files and platforms without mmap fall back to a plain read.
+    """
+    try:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return orjson.loads(f.read())
+    mv = memoryview(mm)
+    try:
+        return orjson.loads(mv)
+    except TypeError:
+        # The stdlib-json fallback shim only accepts bytes/str.
+        return orjson.loads(mv.tobytes())
+    finally:
+        mv.release()
+        mm.close()
+
+
+def _parse_sd_index(sd_json_path: str, prev: dict = None) -> dict:
+    """Parse structuredefinitions.json into an ordered {key: SDRecord} map.
+
+    *prev* is the map from the previous run, if any: entries whose date is
+    unchanged reuse the prior record verbatim, so an incremental rebuild
+    only allocates for the handful of SDs that actually changed.
+    """
+    if prev is None:
+        prev = {}
+    if ijson is not None:
+        # Stream the top-level object one (key, value) pair at a time so
+        # peak memory stays O(one record) instead of O(file size).
+        by_key = {}
+        _isinstance = isinstance
+        _dict = dict
+        _record = SDRecord
+        _intern = sys.intern
+        _prev_get = prev.get
+        with open(sd_json_path, "rb") as f:
+            for key, value in ijson.kvitems(f, ""):
+                if _isinstance(value, _dict):
+                    date = value.get("date", "N/A")
+                    rec = _prev_get(key)
+                    if rec is None or rec.date != date:
+                        rec = _record(value.get("name", key), _intern(date))
+                    by_key[key] = rec
+        return by_key
+
+    with open(sd_json_path, "rb") as f:
+        data = _loads_mapped(f)
+
+    if not isinstance(data, dict):
+        return {}
+    resources = extract_sd(data, SDRecord)
+    if prev:
+        _prev_get = prev.get
+        resources = [
+            old
+            if (old := _prev_get(key)) is not None and old.date == rec.date
+            else rec
+            for key, rec in zip(data.keys(), resources)
+        ]
+    return dict(zip(data.keys(), resources))
+
+
+@functools.lru_cache(maxsize=8)
+def _get_sd_cached(sd_json_path: str, mtime_ns: int, size: int) -> list:
+    """Parse the SD index, reusing an on-disk cache keyed on (mtime_ns, size).
+
+    The pickle sidecar lives next to the IG's temp output so repeat runs of
+    the pipeline (or sibling processes) skip the JSON parse entirely when
+    the index is unchanged. Any edit to the file changes mtime_ns, which
+    invalidates both caches automatically.
+    """
+    temp_dir = os.path.dirname(os.path.dirname(os.path.dirname(sd_json_path)))
+    cache_path = os.path.join(temp_dir, ".sd_index_cache.pkl")
+    prev = None
+    try:
+        with open(cache_path, "rb") as f:
+            cached = pickle.load(f)
+        prev = {
+            key: SDRecord._make(t) for key, t in cached.get("by_key", {}).items()
+        }
+        if cached.get("mtime_ns") == mtime_ns and cached.get("size") == size:
+            return list(prev.values())
+    except (OSError, pickle.PickleError, EOFError, AttributeError):
+        pass
+
+    # A stale cache still seeds the incremental parse: unchanged entries
+    # reuse their prior records. The cyclic GC is paused during the parse
+    # (list/dict growth otherwise triggers spurious collections), and the
+    # long-lived records are then frozen into the permanent generation so
+    # later allocation-heavy phases don't rescan them.
+    was_enabled = gc.isenabled()
+    if was_enabled:
+        gc.disable()
+    try:
+        by_key = _parse_sd_index(sd_json_path, prev)
+    finally:
+        if was_enabled:
+            gc.enable()
+    gc.collect()
+    if hasattr(gc, "freeze"):  # not available under PyPy
+        gc.freeze()
+
+    try:
+        # Store plain tuples: SDRecord itself is not importable by pickle
+        # when the script runs as __main__.
+        with open(cache_path, "wb") as f:
+            pickle.dump(
+                {
+                    "mtime_ns": mtime_ns,
+                    "size": size,
+                    "by_key": {key: tuple(r) for key, r in by_key.items()},
+                },
+                f,
+            )
+    except OSError:
+        pass
+    return list(by_key.values())
+
+
+def get_structuredefinitions(ig_root: Path) -> list:
+    """Return the IG's StructureDefinition index as a list of SDRecord.
+
+    Records are lightweight NamedTuples; consumers use rec.name/rec.date.
+    """
+    # One stat doubles as the existence check.
+    sd_json_path = os.path.join(str(ig_root), _SD_REL)
+    try:
+        st = os.stat(sd_json_path)
+    except FileNotFoundError:
+        _log(f"Warning: structuredefinitions.json not found at {sd_json_path}")
+        return []
+    return _get_sd_cached(sd_json_path, st.st_mtime_ns, st.st_size)
+
+
+def get_structuredefinitions_html(ig_root: Path) -> str:
+    """Return the index-page table rows for the SD index as one HTML string.
+
+    Emitting the whole fragment in a single join keeps the injection stage
+    to one allocation and one write — no per-row formatting or HTML parser
+    round-trip downstream.
+    """
+    _escape = html.escape
+    return "\n".join(
+        f"<tr><td>{_escape(rec.name)}</td><td>{_escape(rec.date)}</td></tr>"
+        for rec in get_structuredefinitions(ig_root)
+    )
+
+
+def main() -> int:
+    ig_root = Path(sys.argv[1]) if len(sys.argv) > 1 else Path.cwd()
+    resources = get_structuredefinitions(ig_root)
+    _log(f"Found {len(resources)} StructureDefinitions")
+    _flush_log()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
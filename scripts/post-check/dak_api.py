@@ -0,0 +1,1659 @@
+#!/usr/bin/env python3
+"""Post-check script: generate the DAK API hub for an IG build.
+
+Collects the JSON schemas, JSON-LD vocabularies and OpenAPI documents the
+build produced, wraps them for publication and injects the generated
+documentation into the rendered dak-api.html page.
+"""
+
+import functools
+import io
+import json
+import logging
+import mmap
+import os
+import re
+import sys
+import tempfile
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from html import escape
+
+# HTML parser preference chain: selectolax (Modest engine) and lxml
+# (libxml2) parse large Swagger/Redoc pages 10-50x faster than the
+# pure-Python html.parser BeautifulSoup falls back on.
+try:
+    from selectolax.parser import HTMLParser as _SelectolaxParser
+except ImportError:
+    _SelectolaxParser = None
+try:
+    from lxml import html as _lxml_html
+except ImportError:
+    _lxml_html = None
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+
+# orjson decodes the dict-heavy schema/OpenAPI JSON 3-10x faster than the
+# stdlib and serializes straight to UTF-8 bytes; stdlib json remains the
+# fallback so the pipeline runs anywhere (including PyPy).
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ijson streams large JSON-LD vocabularies node by node; without it the
+# metadata extraction falls back to a full parse.
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+@functools.lru_cache(maxsize=128)
+def _dir_listing(path):
+    """Cached immutable listing of *path* for repeat enumeration."""
+    return tuple(os.listdir(path))
+
+
+def clear_fs_caches():
+    """Drop cached stats/listings after a phase that changed the tree."""
+    _dir_listing.cache_clear()
+
+
+# The output directories repeat across thousands of writes; makedirs with
+# exist_ok=True still stats the whole path each time, so directories are
+# created once and remembered. The lock keeps the set coherent when
+# renderer threads write concurrently.
+_ensured_dirs = set()
+_ensured_dirs_lock = threading.Lock()
+
+
+def _ensure_dir(path):
+    """Create *path* once per process; later calls are a set lookup."""
+    if not path or path in _ensured_dirs:
+        return
+    with _ensured_dirs_lock:
+        if path not in _ensured_dirs:
+            os.makedirs(path, exist_ok=True)
+            _ensured_dirs.add(path)
+
+
+# The parser is picked once at import; per-call the helper is a single
+# indirection instead of a None test plus attribute walk.
+_json_loads = json.loads if orjson is None else orjson.loads
+
+
+def _loads_json(data):
+    """Parse JSON from bytes with orjson when available."""
+    return _json_loads(data)
+
+
+# Below this size the mmap syscall pair costs more than the copy it saves.
+_MMAP_MIN_BYTES = 16384
+
+
+def _read_json(path):
+    """Parse the JSON file at *path*.
+
+    Large files are parsed straight off an mmap so the kernel pages data
+    in as the parser advances and no intermediate bytes copy is made;
+    small files take a plain read, where mmap overhead dominates.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < _MMAP_MIN_BYTES:
+            return _loads_json(f.read())
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return _loads_json(f.read())
+        mv = memoryview(mm)
+        try:
+            return _loads_json(mv)
+        except TypeError:
+            # The stdlib-json fallback only accepts bytes/str.
+            return _loads_json(mv.tobytes())
+        finally:
+            mv.release()
+            mm.close()
+
+
+def _dumps_json(obj, pretty=True):
+    """Serialize *obj* to UTF-8 JSON bytes, indented by default."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    # Compact separators match orjson's output byte-for-byte.
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode(
+        "utf-8"
+    )
+
+
+def _write_bytes(path, data):
+    """Write *data* to *path* in a single unbuffered syscall.
+
+    For outputs already assembled as one bytes object the BufferedWriter
+    layer only adds a copy and its own chunking; a plain descriptor
+    hands the whole buffer to the kernel at once. The loop covers the
+    (theoretical, for regular files) short-write case.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _atomic_write_json(path, data, pretty=False):
+    """Serialize *data* and atomically replace *path* with it.
+
+    The bytes land in a tempfile in the target directory, are fsynced,
+    and os.replace swaps them over the final name in one rename — a
+    reader never observes a partial file and a crash mid-write leaves
+    the previous version intact, so no fallback copy is needed.
+    """
+    payload = _dumps_json(data, pretty=pretty)
+    directory = os.path.dirname(path)
+    _ensure_dir(directory)
+    tmp = tempfile.NamedTemporaryFile(dir=directory or ".", delete=False)
+    try:
+        with tmp:
+            tmp.write(payload)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+            # NamedTemporaryFile creates 0600 and os.replace keeps that
+            # mode; match the 0644 a plain create would have produced so
+            # downstream collectors under another uid can read the report.
+            os.fchmod(tmp.fileno(), 0o644)
+        os.replace(tmp.name, path)
+    except OSError:
+        try:
+            os.unlink(tmp.name)
+        except OSError:
+            pass
+        raise
+
+
+class _Entry:
+    """One QA detail entry.
+
+    A __slots__ instance carries three fixed references (~56 bytes) where
+    the equivalent dict costs ~184; with tens of thousands of merged
+    entries that is megabytes of churn avoided, and the fields iterate
+    cache-friendly on the serialize pass. Dicts are only materialized
+    when the report is finalized.
+    """
+
+    __slots__ = ("message", "timestamp", "details")
+
+    def __init__(self, message, timestamp, details=None):
+        self.message = message
+        self.timestamp = timestamp
+        self.details = details
+
+    def as_dict(self):
+        entry = {"message": self.message, "timestamp": self.timestamp}
+        if self.details:
+            entry["details"] = self.details
+        return entry
+
+
+class QAReporter:
+    """Accumulates QA results for the post-check run and writes the report JSON."""
+
+    def __init__(self, component="dak-api"):
+        self.logger = logging.getLogger(__name__)
+        self.report = {
+            "component": component,
+            "started": datetime.now().isoformat(),
+            "status": "success",
+            "summary": {
+                "successes": 0,
+                "warnings": 0,
+                "errors": 0,
+                "files_processed": 0,
+            },
+            "details": {
+                "successes": [],
+                "warnings": [],
+                "errors": [],
+                "files_processed": [],
+            },
+        }
+
+    @staticmethod
+    def _entry(message, details=None, _ts=None):
+        # _ts lets batch callers stamp many entries with one cached
+        # timestamp instead of a datetime.now().isoformat() per entry.
+        return _Entry(message, _ts or datetime.now().isoformat(), details or None)
+
+    def add_success(self, message, details=None, _ts=None):
+        self.report["details"]["successes"].append(self._entry(message, details, _ts))
+        self.report["summary"]["successes"] += 1
+
+    def add_warning(self, message, details=None, _ts=None):
+        self.report["details"]["warnings"].append(self._entry(message, details, _ts))
+        self.report["summary"]["warnings"] += 1
+
+    def add_error(self, message, details=None, _ts=None):
+        self.report["details"]["errors"].append(self._entry(message, details, _ts))
+        self.report["summary"]["errors"] += 1
+        self.report["status"] = "error"
+
+    def add_file_processed(self, file_path, action, _ts=None):
+        self.report["details"]["files_processed"].append({
+            "file": file_path,
+            "action": action,
+            "timestamp": _ts or datetime.now().isoformat(),
+        })
+        self.report["summary"]["files_processed"] += 1
+
+    def merge_preprocessing_report(self, component_name, details):
+        """Fold a preprocessing component's QA details into this report.
+
+        The entries of one merge are semantically simultaneous, so a single
+        timestamp is computed per invocation and shared across the batch.
+        """
+        ts = datetime.now().isoformat()
+        prefix = f"[{component_name}] "
+        report_details = self.report["details"]
+        summary = self.report["summary"]
+
+        # Build each batch in one comprehension and extend once: a single
+        # attribute lookup and timestamp instead of N add_* dispatches.
+        for kind in ("successes", "warnings", "errors"):
+            batch = [
+                _Entry(
+                    prefix + entry.get("message", ""),
+                    ts,
+                    entry.get("details") or None,
+                )
+                for entry in details.get(kind, [])
+            ]
+            if batch:
+                report_details[kind].extend(batch)
+                summary[kind] += len(batch)
+        if details.get("errors"):
+            self.report["status"] = "error"
+
+        files = [
+            {
+                "file": entry.get("file", ""),
+                "action": entry.get("action", ""),
+                "timestamp": ts,
+            }
+            for entry in details.get("files_processed", [])
+        ]
+        if files:
+            report_details["files_processed"].extend(files)
+            summary["files_processed"] += len(files)
+
+    def finalize_report(self):
+        """Return the report with detail records materialized as dicts.
+
+        Internal storage stays as _Entry records; the dict views only
+        exist for the duration of the serialize.
+        """
+        self.report["completed"] = datetime.now().isoformat()
+        report = dict(self.report)
+        details = self.report["details"]
+        report["details"] = {
+            kind: [e.as_dict() for e in details[kind]]
+            for kind in ("successes", "warnings", "errors")
+        }
+        report["details"]["files_processed"] = details["files_processed"]
+        return report
+
+    def save_to_file(self, output_path, pretty=False):
+        """Atomically write the finalized report as UTF-8 JSON.
+
+        The report is machine-consumed downstream, so compact output is
+        the default; pass pretty=True when a human needs to read it.
+        The write-then-rename in _atomic_write_json means a crash can
+        only ever leave the previous report behind, never a truncated
+        one, so there is no secondary fallback location to maintain.
+        """
+        try:
+            _atomic_write_json(output_path, self.finalize_report(), pretty=pretty)
+            return True
+        except OSError as e:
+            self.logger.error(f"Could not write QA report to {output_path}: {e}")
+            return False
+
+
+# Injection patterns are compiled once at import: they run against every
+# rendered page the pipeline touches, so per-call re.compile (even with the
+# re module's cache lookup) is pure overhead.
+_PLACEHOLDER_RE = re.compile(
+    rb'<div\s+id="dak-api-content-placeholder"[^>]*>.*?</div>', re.DOTALL
+)
+_PLACEHOLDER_PREFIX = b'<div id="dak-api-content-placeholder"'
+_DIV_CLOSE = b"</div>"
+# The headline variants are folded into one alternation per page kind so
+# the engine walks each multi-MB document once instead of once per
+# variant; leftmost-match semantics preserve the original priority.
+_LM_RX = re.compile(
+    r"<h[23][^>]*>(?:Formal Views of Profile Content|Formal Views)</h[23]>"
+    r".*?</div>\s*</div>",
+    re.DOTALL | re.IGNORECASE,
+)
+_VS_RX = re.compile(
+    r"<h[234][^>]*>Expansion</h[234]>.*?</div>\s*</div>",
+    re.DOTALL | re.IGNORECASE,
+)
+_FALLBACK_RX = re.compile(r"</main>|</body>", re.IGNORECASE)
+
+
+class HTMLProcessor:
+    """Injects generated documentation into rendered IG pages."""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        # Pages within one directory come from the same template, so
+        # whether the placeholder div exists is a per-directory property:
+        # the first file answers it and placeholder-less directories skip
+        # that scan for every later file.
+        self._placeholder_seen_in_dir = {}
+
+    def inject_content_at_comment_marker(
+        self, html_path, content, comment_marker="<!-- DAK_API_CONTENT -->"
+    ):
+        """Replace the placeholder div (or legacy comment marker) with *content*.
+
+        The page is mapped read-only to locate the injection span, then
+        edited in place through a read-write map — the document is never
+        read into Python, never decoded, and only the tail beyond the
+        placeholder moves on disk.
+        """
+        try:
+            with open(html_path, "rb") as f:
+                mm = None
+                try:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except (OSError, ValueError):
+                    pass
+                buf = mm if mm is not None else f.read()
+                try:
+                    span = self._locate_placeholder(
+                        buf, comment_marker, os.path.dirname(html_path)
+                    )
+                finally:
+                    if mm is not None:
+                        mm.close()
+            if span is None:
+                self.logger.warning(f"No injection marker found in {html_path}")
+                return False
+            self._splice_inplace(html_path, span[0], span[1], content.encode("utf-8"))
+            return True
+        except OSError as e:
+            self.logger.error(f"Could not inject content into {html_path}: {e}")
+            return False
+
+    def inject_content_from_bytes(
+        self, html_path, raw, content, comment_marker="<!-- DAK_API_CONTENT -->"
+    ):
+        """Inject *content* into *html_path* whose bytes were already read.
+
+        Callers that have the page in memory (e.g. for marker diagnostics)
+        pass it as *raw* so the file is not read or mapped a second time
+        just to locate the span.
+        """
+        span = self._locate_placeholder(
+            raw, comment_marker, os.path.dirname(html_path)
+        )
+        if span is None:
+            self.logger.warning(f"No injection marker found in {html_path}")
+            return False
+        try:
+            self._splice_inplace(html_path, span[0], span[1], content.encode("utf-8"))
+            return True
+        except OSError as e:
+            self.logger.error(f"Could not inject content into {html_path}: {e}")
+            return False
+
+    def _locate_placeholder(self, buf, comment_marker, dir_key=None):
+        """Return the (start, end) byte span to replace in *buf*, or None.
+
+        The placeholder is a flat empty div in practice, so two
+        memchr-backed finds locate it without walking the page through
+        the DOTALL regex; the regex stays as the fallback for unusual
+        whitespace or nested markup, and the legacy comment marker as the
+        last resort. When *dir_key* is given and the directory is known
+        to be placeholder-less, the placeholder scans are skipped.
+        """
+        if dir_key is None or self._placeholder_seen_in_dir.get(dir_key, True):
+            span = None
+            idx = buf.find(_PLACEHOLDER_PREFIX)
+            if idx >= 0:
+                close = buf.find(_DIV_CLOSE, idx)
+                if close >= 0:
+                    span = (idx, close + len(_DIV_CLOSE))
+            if span is None:
+                match = _PLACEHOLDER_RE.search(buf)
+                if match is not None:
+                    span = (match.start(), match.end())
+            if dir_key is not None and dir_key not in self._placeholder_seen_in_dir:
+                self._placeholder_seen_in_dir[dir_key] = span is not None
+            if span is not None:
+                return span
+        marker = comment_marker.encode("utf-8")
+        idx = buf.find(marker)
+        if idx >= 0:
+            return idx, idx + len(marker)
+        return None
+
+    def _find_injection_point(self, html_content, schema_type="logical_model"):
+        """Return the offset where generated docs belong in a rendered page.
+
+        Logical model pages are targeted after their "Formal Views" block,
+        ValueSet pages after the "Expansion" block; when neither headline
+        exists the content goes just before </main> (or </body>).
+        """
+        rx = _VS_RX if schema_type == "valueset" else _LM_RX
+        match = rx.search(html_content)
+        if match is not None:
+            return match.end()
+        match = _FALLBACK_RX.search(html_content)
+        if match is not None:
+            return match.start()
+        return None
+
+    def inject_at_heuristic_point(self, html_path, content,
+                                  schema_type="logical_model"):
+        """Inject *content* into a page that carries no marker of its own.
+
+        Publisher-rendered pages predate the placeholder div, so this
+        falls back to the headline heuristics in _find_injection_point.
+        Returns True when an insertion point was found and written.
+        """
+        try:
+            with open(html_path, "r", encoding="utf-8") as f:
+                html_content = f.read()
+        except OSError as e:
+            self.logger.error(f"Could not read {html_path}: {e}")
+            return False
+        offset = self._find_injection_point(html_content, schema_type)
+        if offset is None:
+            return False
+        try:
+            _write_bytes(
+                html_path,
+                (
+                    html_content[:offset] + content + html_content[offset:]
+                ).encode("utf-8"),
+            )
+        except OSError as e:
+            self.logger.error(f"Could not inject content into {html_path}: {e}")
+            return False
+        return True
+
+    def _splice_inplace(self, html_path, start, end, payload):
+        """Splice *payload* over bytes [start:end) of html_path in place.
+
+        The file is mapped read-write and the tail is moved with mm.move
+        (a single memmove in the page cache), so only the bytes after the
+        placeholder are touched — no full rewrite, no second copy of the
+        document, no tempfile churn.
+        """
+        fd = os.open(html_path, os.O_RDWR)
+        try:
+            old_size = os.fstat(fd).st_size
+            tail = old_size - end
+            new_size = old_size - (end - start) + len(payload)
+            if new_size > old_size:
+                os.ftruncate(fd, new_size)
+            mm = mmap.mmap(fd, max(new_size, old_size))
+            try:
+                if tail:
+                    mm.move(start + len(payload), end, tail)
+                mm[start:start + len(payload)] = payload
+                mm.flush()
+            finally:
+                mm.close()
+            if new_size < old_size:
+                os.ftruncate(fd, new_size)
+        finally:
+            os.close(fd)
+
+
+# Enumeration schemas are outputs of a previous run; one dict membership
+# test replaces the pair of equality checks, and the prefix constants keep
+# the per-entry work to at most one scan each.
+_ENUM_SCHEMAS = {
+    "ValueSets.schema.json": "valueset",
+    "LogicalModels.schema.json": "logical_model",
+}
+_VS_PREFIX = "ValueSet-"
+_CS_PREFIX = "CodeSystem-"
+
+
+class SchemaDetector:
+    """Finds JSON schema and JSON-LD artifacts in an IG output tree."""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def find_schema_files(self, schema_dir):
+        """Return {'valueset': [...], 'logical_model': [...]} schema paths.
+
+        Categorizes every *.schema.json directly under *schema_dir*.
+        Enumeration schemas left over from a previous run are skipped, as
+        are CodeSystem schemas (they are published but not documented).
+        """
+        schemas = {"valueset": [], "logical_model": []}
+        # One open of the directory doubles as the existence check —
+        # no separate stat syscall on the happy path.
+        try:
+            it = os.scandir(schema_dir)
+        except (FileNotFoundError, NotADirectoryError):
+            self.logger.warning(f"Schema directory not found: {schema_dir}")
+            return schemas
+
+        schema_count = 0
+        with it:
+            for entry in it:
+                # d_type from getdents makes this free on Linux.
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                name = entry.name
+                if not name.endswith(".schema.json"):
+                    continue
+                if name in _ENUM_SCHEMAS:
+                    continue
+                schema_count += 1
+                if name.startswith(_VS_PREFIX):
+                    schemas["valueset"].append(entry.path)
+                    self.logger.info("Found ValueSet schema: %s", name)
+                elif name.startswith(_CS_PREFIX):
+                    self.logger.info("Skipping CodeSystem schema: %s", name)
+                else:
+                    schemas["logical_model"].append(entry.path)
+                    self.logger.info("Found logical model schema: %s", name)
+
+        if schema_count == 0:
+            # Build the listing only on the diagnostic path; the happy path
+            # never materializes the full directory.
+            self.logger.warning(f"No schema files found in {schema_dir}")
+            self.logger.warning(f"Directory contents: {sorted(_dir_listing(schema_dir))}")
+        return schemas
+
+    def find_jsonld_files(self, schema_dir):
+        """Return the *.jsonld vocabulary paths directly under *schema_dir*."""
+        jsonld_files = []
+        try:
+            it = os.scandir(schema_dir)
+        except (FileNotFoundError, NotADirectoryError):
+            self.logger.warning(f"Schema directory not found: {schema_dir}")
+            return jsonld_files
+
+        with it:
+            for entry in it:
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                if entry.name.endswith(".jsonld"):
+                    jsonld_files.append(entry.path)
+                    self.logger.info("Found JSON-LD file: %s", entry.name)
+        return jsonld_files
+
+
+_OPENAPI_EXTS = (".json", ".yaml", ".yml")
+
+# Ordered longest-first so "x.openapi.json" strips as one suffix; a
+# break-on-first-match removesuffix is both cheaper and safer than
+# chained str.replace, which would also mangle internal occurrences.
+_OPENAPI_SUFFIXES = (".openapi.json", ".openapi.yaml", ".yaml", ".yml", ".json")
+
+
+def _strip_openapi_suffix(filename):
+    """Return *filename* minus its OpenAPI document suffix, if any."""
+    for suffix in _OPENAPI_SUFFIXES:
+        if filename.endswith(suffix):
+            return filename[: -len(suffix)]
+    return filename
+
+
+def _iter_openapi_files(root):
+    """Yield OpenAPI-looking DirEntry objects under *root*, depth-first.
+
+    Iterative scandir recursion: the cheap lowercased-name predicate runs
+    before any is_file call, so uninteresting files never cost more than
+    their getdents batch (d_type makes the type checks stat-free on
+    Linux).
+    """
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                name_lc = entry.name.lower()
+                if name_lc == "index.html":
+                    continue
+                if name_lc.endswith(_OPENAPI_EXTS) and (
+                    "openapi" in name_lc
+                    or "swagger" in name_lc
+                    or "api" in name_lc
+                ):
+                    if entry.is_file(follow_symlinks=False):
+                        yield entry
+                elif entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+
+
+class OpenAPIDetector:
+    """Finds OpenAPI documents and pre-rendered API console pages."""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def find_openapi_files(self, search_dir):
+        """Return OpenAPI/Swagger document paths found under *search_dir*."""
+        openapi_files = []
+        try:
+            for entry in _iter_openapi_files(search_dir):
+                openapi_files.append(entry.path)
+                self.logger.info("Found OpenAPI file: %s", entry.name)
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+        return openapi_files
+
+    def find_existing_html_content(self, html_path):
+        """Extract the main content subtree of a pre-rendered console page.
+
+        Tries selectolax, then lxml, then BeautifulSoup; the two C-backed
+        parsers handle the multi-MB Swagger/Redoc pages this sees at a
+        fraction of html.parser's cost.
+        """
+        try:
+            with open(html_path, "r", encoding="utf-8") as f:
+                html_content = f.read()
+        except OSError as e:
+            self.logger.warning(f"Could not read {html_path}: {e}")
+            return None
+
+        if _SelectolaxParser is not None:
+            tree = _SelectolaxParser(html_content)
+            for node in tree.css("script,noscript"):
+                node.decompose()
+            body = tree.body
+            if body is None:
+                return None
+            node = (
+                body.css_first("div[class*=container]")
+                or body.css_first("div[class*=content]")
+                or tree.css_first("main")
+                or body
+            )
+            return node.html
+
+        if _lxml_html is not None:
+            doc = _lxml_html.fromstring(html_content)
+            for node in doc.xpath("//script|//noscript"):
+                node.getparent().remove(node)
+            candidates = (
+                doc.xpath('//body//div[contains(@class, "container")]')
+                or doc.xpath('//body//div[contains(@class, "content")]')
+                or doc.xpath("//main")
+                or doc.xpath("//body")
+            )
+            if not candidates:
+                return None
+            return _lxml_html.tostring(candidates[0], encoding="unicode")
+
+        if BeautifulSoup is not None:
+            soup = BeautifulSoup(html_content, "html.parser")
+            for tag in soup(["script", "noscript"]):
+                tag.decompose()
+            body = soup.body
+            if body is None:
+                return None
+            node = (
+                body.find("div", class_=lambda c: c and "container" in c)
+                or body.find("div", class_=lambda c: c and "content" in c)
+                or soup.find("main")
+                or body
+            )
+            return str(node)
+
+        self.logger.warning("No HTML parser available (selectolax/lxml/bs4)")
+        return None
+
+
+class OpenAPIWrapper:
+    """Creates OpenAPI wrapper documents for generated JSON schemas."""
+
+    def __init__(self, canonical_base="", inline_schema=False):
+        self.logger = logging.getLogger(__name__)
+        self.canonical_base = canonical_base.rstrip("/")
+        # The response already references the sibling schema file by
+        # relative $ref; embedding a full copy under components doubles
+        # every wrapper's size and serialize time, so it is opt-in.
+        self.inline_schema = inline_schema
+        self._schema_cache = {}
+        self._schema_cache_lock = threading.Lock()
+
+    _SCHEMA_CACHE_MAX = 256
+
+    def _load_schema(self, schema_path):
+        """Return the parsed schema, cached on (path, mtime_ns).
+
+        Shared schemas (the enumeration files referenced by many wrappers)
+        are parsed once per run; the FIFO bound keeps worst-case memory
+        flat on huge IGs. One wrapper instance is shared across the
+        per-schema worker threads, so the dict lookups and the eviction
+        run under a lock — the parse itself happens outside it, so at
+        worst two racing threads parse the same file once each.
+        """
+        key = (schema_path, os.stat(schema_path).st_mtime_ns)
+        with self._schema_cache_lock:
+            cached = self._schema_cache.get(key)
+        if cached is not None:
+            return cached
+        schema = _read_json(schema_path)
+        with self._schema_cache_lock:
+            if len(self._schema_cache) >= self._SCHEMA_CACHE_MAX:
+                self._schema_cache.pop(next(iter(self._schema_cache)))
+            self._schema_cache[key] = schema
+        return schema
+
+    def create_wrapper_for_schema(self, schema_path, schema_type, output_dir):
+        """Write a <name>.openapi.json wrapper for one schema.
+
+        Returns (wrapper_path, title, description). The title/description
+        come from the parse this method performs anyway, so callers that
+        need schema metadata don't re-read the file. wrapper_path is None
+        when the wrapper could not be written; all three are None when the
+        schema itself cannot be read.
+        """
+        try:
+            schema = self._load_schema(schema_path)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Could not load schema {schema_path}: {e}")
+            return None, None, None
+
+        # rpartition/f-string path math: os.path.basename/join run once
+        # per schema here and their generality (sep detection, repeated
+        # scans) is pure overhead on these known-shape paths.
+        schema_filename = schema_path.rpartition(os.sep)[2]
+        schema_name = schema_filename.removesuffix(".schema.json")
+        title = schema.get("title", schema_name)
+        description = schema.get("description", "")
+        api_description = description or f"API for {schema_name}"
+
+        spec = {
+            "openapi": "3.0.3",
+            "info": {
+                "title": f"{title} API",
+                "description": api_description,
+                "version": "1.0.0",
+            },
+            "paths": {
+                f"/{schema_name}": {
+                    "get": {
+                        "summary": f"Retrieve {title}",
+                        "operationId": f"get{schema_name.replace('-', '')}",
+                        "responses": {
+                            "200": {
+                                "description": api_description,
+                                "content": {
+                                    "application/json": {
+                                        "schema": {"$ref": f"./{schema_filename}"}
+                                    }
+                                },
+                            }
+                        },
+                    }
+                }
+            },
+            "components": {
+                "schemas": {
+                    schema_name: schema
+                    if self.inline_schema
+                    else {"$ref": f"./{schema_filename}"}
+                }
+            },
+        }
+
+        _ensure_dir(output_dir)
+        wrapper_path = f"{output_dir}{os.sep}{schema_name}.openapi.json"
+        try:
+            _write_bytes(wrapper_path, _dumps_json(spec))
+        except OSError as e:
+            self.logger.error(f"Could not write wrapper {wrapper_path}: {e}")
+            return None, title, description
+        self.logger.info(f"Created OpenAPI wrapper: {wrapper_path}")
+        return wrapper_path, title, description
+
+    def create_enumeration_wrapper(self, enum_schema_path, schema_type, output_dir):
+        """Write the wrapper for a ValueSets/LogicalModels enumeration schema."""
+        return self.create_wrapper_for_schema(
+            enum_schema_path, schema_type, output_dir
+        )
+
+
+class SchemaDocumentationRenderer:
+    """Renders HTML documentation for OpenAPI wrapper documents."""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.html_processor = HTMLProcessor()
+        # Schemas whose pretty dump exceeds this are linked rather than
+        # inlined: embedding a multi-hundred-KB logical model bloats the
+        # page (and the browser's parse time) for content the sibling
+        # .schema.json file already serves.
+        self.inline_threshold_bytes = 65536
+
+    def _generate_html_content(self, spec_data):
+        """Return the documentation fragment for one OpenAPI spec as a string."""
+        buf = io.StringIO()
+        self._write_html_content(spec_data, buf)
+        return buf.getvalue()
+
+    def _write_html_content(self, spec_data, out):
+        """Write the documentation fragment for one OpenAPI spec to *out*.
+
+        Streaming into the caller's file-like (a StringIO, or the output
+        file itself) means the fragment is never materialized twice;
+        user-supplied titles/descriptions are escaped once on the way in.
+        """
+        write = out.write
+        info = spec_data.get("info", {})
+        write('<div class="openapi-doc">\n')
+        write(f"<h3>{escape(info.get('title', 'API'))}</h3>\n")
+        if info.get("description"):
+            write(f"<p>{escape(info['description'])}</p>\n")
+
+        paths = spec_data.get("paths", {})
+        if paths:
+            write("<h4>Endpoints</h4>\n<ul>\n")
+            for path, ops in sorted(paths.items()):
+                for method, op in ops.items():
+                    summary = escape(op.get("summary", ""))
+                    write(
+                        f"<li><code>{method.upper()} {escape(path)}</code> {summary}</li>\n"
+                    )
+            write("</ul>\n")
+
+        schemas = spec_data.get("components", {}).get("schemas", {})
+        threshold = self.inline_threshold_bytes
+        for name, sdef in sorted(schemas.items()):
+            dumped = _dumps_json(sdef)
+            if len(dumped) > threshold:
+                write(
+                    f'<p><a href="./{escape(name)}.schema.json" download>'
+                    f"{escape(name)} schema</a></p>\n"
+                )
+                continue
+            write(f"<details>\n<summary>{escape(name)} schema</summary>\n<pre><code>")
+            write(escape(dumped.decode("utf-8")))
+            write("</code></pre>\n</details>\n")
+
+        write("</div>")
+
+    def inject_into_html(self, openapi_path, output_dir, title=None):
+        """Render docs for *openapi_path* into its page under *output_dir*.
+
+        Injects into an existing rendered page when one is present,
+        otherwise writes a standalone fragment page. Returns the page
+        filename, or None on failure.
+        """
+        try:
+            spec_data = _read_json(openapi_path)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Could not load OpenAPI spec {openapi_path}: {e}")
+            return None
+
+        base_name = _strip_openapi_suffix(openapi_path.rpartition(os.sep)[2])
+        html_filename = f"{base_name}.html"
+        html_path = f"{output_dir}{os.sep}{html_filename}"
+
+        if os.path.exists(html_path):
+            # Injection needs the fragment as one string for the splice.
+            content = self._generate_html_content(spec_data)
+            if title:
+                content = f"<h2>{title}</h2>\n{content}"
+            if not self.html_processor.inject_content_at_comment_marker(
+                html_path, content
+            ) and not self.html_processor.inject_at_heuristic_point(
+                html_path, content
+            ):
+                self.logger.warning(f"No injection point in {html_path}")
+                return None
+        else:
+            # Standalone page: stream straight into the file handle, the
+            # fragment is never held in memory.
+            try:
+                with open(html_path, "w", encoding="utf-8") as f:
+                    if title:
+                        f.write(f"<h2>{title}</h2>\n")
+                    self._write_html_content(spec_data, f)
+            except OSError as e:
+                self.logger.error(f"Could not write {html_path}: {e}")
+                return None
+        self.logger.info(f"Rendered OpenAPI documentation: {html_path}")
+        return html_filename
+
+
+@functools.lru_cache(maxsize=4096)
+def _load_schema_cached(path, mtime_ns):
+    """Parsed schema for *path*, cached process-wide on (path, mtime).
+
+    The enumeration build, the wrapper step and the hub renderer all
+    touch the same schema files; keying on mtime_ns means each file is
+    parsed at most once per run while edits still invalidate naturally.
+    """
+    return _read_json(path)
+
+
+# Enumeration output filename per schema kind (inverse of _ENUM_SCHEMAS).
+_ENUM_FILENAMES = {
+    "valueset": "ValueSets.schema.json",
+    "logical_model": "LogicalModels.schema.json",
+}
+_ENUM_TITLES = {"valueset": "ValueSets", "logical_model": "LogicalModels"}
+
+# The enumeration schema's fixed shape, frozen as serialized bytes at
+# import: each call deserializes the skeleton (one fast C-level parse)
+# and patches the four varying fields instead of re-allocating ~15
+# nested dict literals.
+_ENUM_SKELETON_BYTES = _dumps_json(
+    {
+        "$schema": "http://json-schema.org/draft-07/schema#",
+        "$id": "",
+        "title": "",
+        "description": "",
+        "type": "object",
+        "properties": {
+            "type": {"type": "string"},
+            "count": {"type": "integer"},
+            "schemas": {"type": "array", "items": {"type": "object"}},
+        },
+        "example": {"type": "", "count": 0, "schemas": []},
+    },
+    pretty=False,
+)
+
+
+# One write per card: the whole fragment is a single format_map over the
+# card's fields instead of a dozen list.append calls per schema.
+_VALUESET_CARD_TMPL = (
+    '<div class="schema-card valueset-card" id="{base}">'
+    '<h4><a href="{html_file}">{title}</a></h4>'
+    "<p>{description}</p>"
+    '<div class="schema-links">{links}</div>'
+    "</div>\n"
+)
+_LOGICAL_MODEL_CARD_TMPL = (
+    '<div class="schema-card logical-model-card" id="{base}">'
+    '<h4><a href="{html_file}">{title}</a></h4>'
+    "<p>{description}</p>"
+    '<div class="schema-links">{links}</div>'
+    "</div>\n"
+)
+# (doc key, title attribute, label) rows driving the optional link row of
+# each card; one loop replaces the per-kind chains of if/append blocks.
+LINK_SPECS_VS = (
+    ("schema_file", "JSON Schema", "Schema"),
+    ("displays_file", "Display Names", "Displays"),
+    ("openapi_file", "OpenAPI Specification", "OpenAPI"),
+    ("jsonld_file", "JSON-LD Vocabulary", "JSON-LD"),
+)
+LINK_SPECS_LM = (
+    ("schema_file", "JSON Schema", "Schema"),
+    ("openapi_file", "OpenAPI Specification", "OpenAPI"),
+    ("jsonld_file", "JSON-LD Vocabulary", "JSON-LD"),
+)
+
+_ENUM_CARD_TMPL = (
+    '<div class="schema-card enumeration-card">'
+    '<h4><a href="{schema_file}">{title}</a></h4>'
+    "<p>{description}</p>"
+    "</div>\n"
+)
+
+# Fixed hub fragments, interned once at import so the per-call path only
+# writes references.
+_HUB_OPEN_HTML = (
+    '<div class="dak-api-hub">\n'
+    "<p>Machine-readable representations of the data dictionary "
+    "published by this implementation guide.</p>\n"
+)
+_VS_SECTION_OPEN = '<h3>ValueSet APIs</h3>\n<div class="schema-grid">\n'
+_LM_SECTION_OPEN = '<h3>Logical Model APIs</h3>\n<div class="schema-grid">\n'
+_ENUM_SECTION_OPEN = '<h3>Enumeration Schemas</h3>\n<div class="schema-grid">\n'
+_OPENAPI_SECTION_OPEN = '<h3>OpenAPI Documents</h3>\n<ul class="openapi-list">\n'
+_JSONLD_SECTION_OPEN = '<h3>JSON-LD Vocabularies</h3>\n<ul class="jsonld-list">\n'
+_SECTION_CLOSE = "</div>\n"
+_HUB_FOOTER_HTML = """<h3>Usage</h3>
+<p>Each schema is published as a standalone JSON Schema document and,
+where available, with an OpenAPI wrapper and a JSON-LD vocabulary.
+Fetch them directly or browse the per-schema documentation pages
+linked above.</p>
+<style>
+.dak-api-hub .schema-grid { display: grid; grid-template-columns: repeat(auto-fill, minmax(280px, 1fr)); gap: 1rem; }
+.dak-api-hub .schema-card { border: 1px solid #ddd; border-radius: 4px; padding: 0.75rem; }
+.dak-api-hub .schema-card h4 { margin: 0 0 0.5rem 0; }
+.dak-api-hub .schema-links a { margin-right: 0.5rem; font-size: 0.85em; }
+</style>
+</div>
+"""
+
+
+class DAKApiHubGenerator:
+    """Builds the DAK API hub page and the per-kind enumeration schemas."""
+
+    def __init__(self, canonical_base=""):
+        self.logger = logging.getLogger(__name__)
+        self.canonical_base = canonical_base.rstrip("/")
+
+    def create_enumeration_schema(self, schema_type, schema_paths, output_dir):
+        """Write the enumeration schema listing all *schema_type* schemas.
+
+        Returns the written path, or None when the kind is unknown or the
+        write fails. Unreadable member schemas are skipped with a warning.
+        """
+        enum_filename = _ENUM_FILENAMES.get(schema_type)
+        if enum_filename is None:
+            self.logger.warning(f"Unknown schema type: {schema_type}")
+            return None
+
+        kind_title = _ENUM_TITLES[schema_type]
+        envelope = _loads_json(_ENUM_SKELETON_BYTES)
+        envelope["$id"] = f"{self.canonical_base}/{enum_filename}"
+        envelope["title"] = f"{kind_title} Enumeration"
+        envelope["description"] = (
+            f"Enumeration of the {kind_title} JSON schemas published by this IG"
+        )
+        # The example object is streamed below, one serialized entry at a
+        # time, so the member list is never materialized — peak memory is
+        # one entry regardless of how many schemas the IG publishes.
+        del envelope["example"]
+        head = _dumps_json(envelope, pretty=False)
+
+        _ensure_dir(output_dir)
+        enum_path = f"{output_dir}{os.sep}{enum_filename}"
+        count = 0
+        try:
+            with open(enum_path, "wb") as f:
+                f.write(head[:-1])  # re-open the envelope's closing brace
+                f.write(b',"example":{"type":"')
+                f.write(schema_type.encode("ascii"))
+                f.write(b'","schemas":[')
+                sep = b""
+                for schema_path in schema_paths:
+                    try:
+                        schema = _load_schema_cached(
+                            schema_path, os.stat(schema_path).st_mtime_ns
+                        )
+                    except (OSError, ValueError) as e:
+                        self.logger.warning(
+                            f"Could not load schema {schema_path}: {e}"
+                        )
+                        continue
+                    # rpartition is one C call with no os.path dispatch
+                    # and degrades to the whole string when no separator
+                    # is present.
+                    filename = schema_path.rpartition(os.sep)[2]
+                    base = filename.removesuffix(".schema.json")
+                    f.write(sep)
+                    f.write(
+                        _dumps_json(
+                            {
+                                "name": base,
+                                "file": f"schemas/{filename}",
+                                "title": schema.get("title", base),
+                                "description": schema.get("description", ""),
+                            },
+                            pretty=False,
+                        )
+                    )
+                    sep = b","
+                    count += 1
+                f.write(b'],"count":%d}}' % count)
+        except OSError as e:
+            self.logger.error(f"Could not write {enum_path}: {e}")
+            return None
+        self.logger.info(
+            "Created %s enumeration schema: %s", schema_type, enum_path
+        )
+        return enum_path
+
+    def generate_hub_html_content(
+        self, schema_docs, enumeration_docs=None, openapi_docs=None,
+        jsonld_docs=None,
+    ):
+        """Return the hub page fragment for the collected documentation.
+
+        Emits into one StringIO with a single templated write per card;
+        no fragment list is accumulated or joined.
+        """
+        # One dict lookup per section, hoisted: the lists are consulted
+        # for both the presence test and the iteration.
+        vs_list = schema_docs.get("valueset") or ()
+        lm_list = schema_docs.get("logical_model") or ()
+
+        buf = io.StringIO()
+        buf.write(_HUB_OPEN_HTML)
+
+        if vs_list:
+            buf.write(_VS_SECTION_OPEN)
+            for s in vs_list:
+                # Computed once per card and cached on the doc dict so the
+                # enumeration/OpenAPI sections (and repeat renders) reuse
+                # it; basename+removesuffix is two C calls where the old
+                # double .replace() scanned the string twice.
+                base = s.get("_base")
+                if base is None:
+                    # schema_file is an href, so the separator is always
+                    # "/"; rpartition is one C call with no os.path
+                    # dispatch.
+                    base = s["_base"] = (
+                        s["schema_file"]
+                        .rpartition("/")[2]
+                        .removesuffix(".schema.json")
+                    )
+                links = "".join(
+                    f'<a href="{v}" class="schema-link" '
+                    f'title="{title}">{label}</a>'
+                    for key, title, label in LINK_SPECS_VS
+                    if (v := s.get(key))
+                )
+                buf.write(
+                    _VALUESET_CARD_TMPL.format_map(
+                        {
+                            "base": base,
+                            "html_file": s.get("html_file", s["schema_file"]),
+                            "title": s.get("title", base),
+                            "description": s.get("description", ""),
+                            "links": links,
+                        }
+                    )
+                )
+            buf.write(_SECTION_CLOSE)
+
+        if lm_list:
+            buf.write(_LM_SECTION_OPEN)
+            for s in lm_list:
+                base = s.get("_base")
+                if base is None:
+                    # schema_file is an href, so the separator is always
+                    # "/"; rpartition is one C call with no os.path
+                    # dispatch.
+                    base = s["_base"] = (
+                        s["schema_file"]
+                        .rpartition("/")[2]
+                        .removesuffix(".schema.json")
+                    )
+                links = "".join(
+                    f'<a href="{v}" class="schema-link" '
+                    f'title="{title}">{label}</a>'
+                    for key, title, label in LINK_SPECS_LM
+                    if (v := s.get(key))
+                )
+                buf.write(
+                    _LOGICAL_MODEL_CARD_TMPL.format_map(
+                        {
+                            "base": base,
+                            "html_file": s.get("html_file", s["schema_file"]),
+                            "title": s.get("title", base),
+                            "description": s.get("description", ""),
+                            "links": links,
+                        }
+                    )
+                )
+            buf.write(_SECTION_CLOSE)
+
+        if enumeration_docs:
+            buf.write(_ENUM_SECTION_OPEN)
+            for e in enumeration_docs:
+                buf.write(_ENUM_CARD_TMPL.format_map(e))
+            buf.write(_SECTION_CLOSE)
+
+        if openapi_docs:
+            buf.write(_OPENAPI_SECTION_OPEN)
+            for doc in openapi_docs:
+                buf.write(
+                    f'<li><a href="{doc["html_file"]}">{doc["title"]}</a></li>\n'
+                )
+            buf.write("</ul>\n")
+
+        if jsonld_docs:
+            buf.write(_JSONLD_SECTION_OPEN)
+            for doc in jsonld_docs:
+                buf.write(
+                    f'<li><a href="{doc["file"]}" title="{doc["description"]}">'
+                    f'{doc["title"]}</a></li>\n'
+                )
+            buf.write("</ul>\n")
+
+        buf.write(_HUB_FOOTER_HTML)
+        return buf.getvalue()
+
+
+def setup_logging(level=logging.INFO):
+    """Configure logging for the post-check run."""
+    logging.basicConfig(level=level, format="%(levelname)s %(name)s: %(message)s")
+
+
+# Preprocessing components whose QA output is folded into this run's
+# report, as (component, path relative to the IG root) pairs.
+_QA_REPORT_SOURCES = (
+    ("schema-generator", os.path.join("temp", "qa", "schema-generator-qa.json")),
+    ("valueset-displays", os.path.join("temp", "qa", "valueset-displays-qa.json")),
+    ("jsonld-generator", os.path.join("temp", "qa", "jsonld-generator-qa.json")),
+    ("openapi-generator", os.path.join("temp", "qa", "openapi-generator-qa.json")),
+)
+
+
+def try_merge(path):
+    """Read and parse one preprocessing QA file.
+
+    Returns the parsed dict, or None when the file is missing or invalid.
+    Pure read/parse — the actual merge happens on the main thread so the
+    reporter needs no locking.
+    """
+    try:
+        with open(path, "rb") as f:
+            return _loads_json(f.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        logging.getLogger(__name__).warning("Could not read QA report %s", path)
+        return None
+
+
+def merge_preprocessing_reports(qa_reporter, ig_root):
+    """Fold the preprocessing components' QA files into *qa_reporter*.
+
+    The four reads are independent and latency-bound, so they run on a
+    small thread pool and overlap; merging stays sequential on the
+    caller's thread.
+    """
+    paths = [os.path.join(ig_root, rel) for _, rel in _QA_REPORT_SOURCES]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        parsed = list(executor.map(try_merge, paths))
+    for (component, _), details in zip(_QA_REPORT_SOURCES, parsed):
+        if details:
+            qa_reporter.merge_preprocessing_report(
+                component, details.get("details", details)
+            )
+
+
+def _process_schema(schema_path, kind, schema_output_dir, openapi_wrapper,
+                    existing_artifacts):
+    """Build the hub doc entry for one schema of *kind*.
+
+    Creates the schema's OpenAPI wrapper and records which optional
+    sibling artifacts (displays, OpenAPI, JSON-LD) exist.
+    *existing_artifacts* is the caller's one-scandir snapshot of the
+    schemas directory: membership tests replace the per-file stat
+    syscalls. Returns the entry dict, or None when the schema cannot be
+    processed. Thread-safe: every write targets files derived from this
+    schema's name only.
+    """
+    logger = logging.getLogger(__name__)
+    try:
+        # The wrapper parses the schema anyway and hands back the
+        # title/description, so no second parse happens here.
+        wrapper_path, title, description = (
+            openapi_wrapper.create_wrapper_for_schema(
+                schema_path, kind, schema_output_dir
+            )
+        )
+        if title is None:
+            # Schema unreadable; the wrapper already logged why.
+            return None
+        filename = schema_path.rpartition(os.sep)[2]
+        base = filename.removesuffix(".schema.json")
+        entry = {
+            "schema_file": f"schemas/{filename}",
+            "html_file": f"{base}.html",
+            "title": title,
+            "description": description,
+            "_base": base,
+        }
+
+        # One gate, one record: each info line would otherwise allocate
+        # a LogRecord and take the handler lock — per schema, times four,
+        # across every pool worker. When INFO is off nothing is built.
+        info_enabled = logger.isEnabledFor(logging.INFO)
+        lines = [] if info_enabled else None
+
+        if kind == "valueset":
+            displays_filename = f"{base}.displays.json"
+            if displays_filename in existing_artifacts:
+                entry["displays_file"] = f"schemas/{displays_filename}"
+                if info_enabled:
+                    lines.append(f"Found displays file: {displays_filename}")
+        # The wrapper was written by this worker just above, so its
+        # return value answers the existence question without consulting
+        # the (older) snapshot.
+        if wrapper_path is not None:
+            entry["openapi_file"] = f"schemas/{base}.openapi.json"
+            if info_enabled:
+                lines.append(f"Found OpenAPI file: {base}.openapi.json")
+        jsonld_filename = f"{base}.jsonld"
+        if jsonld_filename in existing_artifacts:
+            entry["jsonld_file"] = f"schemas/{jsonld_filename}"
+            if info_enabled:
+                lines.append(f"Found JSON-LD file: {jsonld_filename}")
+
+        if info_enabled:
+            lines.append(f"Processed {kind} schema: {filename}")
+            logger.info("\n".join(lines))
+        return entry
+    except (OSError, ValueError) as e:
+        # json.JSONDecodeError and orjson's equivalent are ValueError
+        # subclasses, so this covers unreadable files and bad JSON — the
+        # only failures a schema can legitimately produce here. The
+        # traceback goes to debug: format_exc() is expensive and the
+        # one-line message carries everything a normal run needs.
+        logger.error("Error processing %s: %s", schema_path, e)
+        logger.debug(traceback.format_exc())
+        return None
+
+
+def _scan_openapi(roots):
+    """Discover OpenAPI documents under *roots* in a single pass.
+
+    *roots* is an iterable of (directory, category) pairs, highest
+    precedence first. Returns [(path, category, name), ...] with
+    filenames deduplicated across roots as they are found, so each
+    directory is walked exactly once and no second dedup pass or
+    re-scan of overlapping trees is needed.
+    """
+    logger = logging.getLogger(__name__)
+    seen = set()
+    found = []
+    for root, category in roots:
+        try:
+            for entry in _iter_openapi_files(root):
+                name = entry.name
+                if name not in seen:
+                    seen.add(name)
+                    found.append((entry.path, category, name))
+                    logger.info("Found OpenAPI file: %s", name)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+    return found
+
+
+def _build_enumeration(kind, schema_paths, schema_output_dir, hub_generator,
+                       openapi_wrapper):
+    """Build the enumeration schema and wrapper for one schema kind.
+
+    Returns (enum_path, hub doc entry), or None when the enumeration
+    could not be written. The two kinds touch disjoint output files, so
+    they run safely on separate threads.
+    """
+    enum_path = hub_generator.create_enumeration_schema(
+        kind, schema_paths, schema_output_dir
+    )
+    if enum_path is None:
+        return None
+    openapi_wrapper.create_enumeration_wrapper(enum_path, kind, schema_output_dir)
+    return enum_path, {
+        "schema_file": f"schemas/{_ENUM_FILENAMES[kind]}",
+        "title": f"{_ENUM_TITLES[kind]} Enumeration",
+        "description": f"Index of all published {_ENUM_TITLES[kind]}",
+    }
+
+
+def _render_openapi_doc(openapi_path, output_dir, renderer):
+    """Render the documentation page for one OpenAPI document.
+
+    Returns the hub doc entry, or None on failure. Thread-safe: each
+    document reads its own spec and writes only its own page, so the
+    batch parallelizes over I/O with no shared state.
+    """
+    clean_name = _strip_openapi_suffix(
+        openapi_path.replace("\\", "/").rpartition("/")[2]
+    )
+    title = f"{clean_name} API"
+    html_filename = renderer.inject_into_html(openapi_path, output_dir, title)
+    if html_filename is None:
+        return None
+    return {"html_file": html_filename, "title": title}
+
+
+def _extract_jsonld_meta(jsonld_path):
+    """Return (title, description) for a JSON-LD vocabulary file.
+
+    Only the first schema:Enumeration node's name/comment matter, so
+    with ijson the @graph is streamed one node at a time and parsing
+    stops at that node — peak memory stays at one node no matter how
+    large the vocabulary grows. Without ijson the whole file is parsed
+    through the shared loader.
+    """
+    fname = jsonld_path.rpartition(os.sep)[2]
+    title = f"{fname.removesuffix('.jsonld')} JSON-LD Vocabulary"
+    description = "JSON-LD vocabulary"
+    try:
+        if ijson is not None:
+            with open(jsonld_path, "rb") as f:
+                for item in ijson.items(f, "@graph.item"):
+                    if item.get("type") == "schema:Enumeration":
+                        title = f"{item.get('name', fname)} JSON-LD Vocabulary"
+                        description = item.get("comment", description)
+                        break
+        else:
+            vocab = _read_json(jsonld_path)
+            for item in vocab.get("@graph", ()):
+                if (
+                    isinstance(item, dict)
+                    and item.get("type") == "schema:Enumeration"
+                ):
+                    title = f"{item.get('name', fname)} JSON-LD Vocabulary"
+                    description = item.get("comment", description)
+                    break
+    except (OSError, ValueError) as e:
+        logging.getLogger(__name__).warning(
+            f"Could not parse JSON-LD {jsonld_path}: {e}"
+        )
+    return title, description
+
+
+def post_process_dak_api_html(output_dir, hub_content, html_processor, qa_reporter=None):
+    """Inject the hub fragment into output/dak-api.html.
+
+    The page is read exactly once: the same bytes serve the marker
+    diagnostic and the injection span lookup via the injector's
+    bytes-reusing entry point.
+    """
+    logger = logging.getLogger(__name__)
+    dak_api_html_path = os.path.join(output_dir, "dak-api.html")
+    try:
+        with open(dak_api_html_path, "rb") as f:
+            raw = f.read()
+    except FileNotFoundError:
+        logger.warning(f"dak-api.html not found at {dak_api_html_path}")
+        if qa_reporter is not None:
+            qa_reporter.add_warning(f"dak-api.html not found at {dak_api_html_path}")
+        return False
+    if _PLACEHOLDER_PREFIX not in raw:
+        logger.info("dak-api.html has no placeholder div; trying fallbacks")
+    injected = html_processor.inject_content_from_bytes(
+        dak_api_html_path, raw, hub_content
+    )
+    if qa_reporter is not None:
+        if injected:
+            qa_reporter.add_file_processed(dak_api_html_path, "injected hub content")
+        else:
+            qa_reporter.add_warning(f"No injection point in {dak_api_html_path}")
+    return injected
+
+
+def main(argv=None):
+    """Run the DAK API post-check for the IG rooted at argv[1] (default cwd)."""
+    argv = sys.argv if argv is None else argv
+    ig_root = argv[1] if len(argv) > 1 else "."
+    setup_logging()
+    logger = logging.getLogger(__name__)
+
+    qa_reporter = QAReporter()
+    merge_preprocessing_reports(qa_reporter, ig_root)
+    qa_path = os.path.join(ig_root, "temp", "qa", "dak-api-qa.json")
+
+    output_dir = os.path.join(ig_root, "output")
+    # One directory pass serves both the count and the sample; scandir
+    # avoids materializing names we never look at beyond the first ten.
+    try:
+        with os.scandir(output_dir) as it:
+            output_entries = list(it)
+    except (FileNotFoundError, NotADirectoryError):
+        logger.error(f"Output directory not found: {output_dir}")
+        qa_reporter.add_error(f"Output directory not found: {output_dir}")
+        qa_reporter.save_to_file(qa_path)
+        return 1
+    logger.info(
+        "Output directory has %d entries; sample: %s",
+        len(output_entries),
+        [e.name for e in output_entries[:10]],
+    )
+
+    schema_output_dir = os.path.join(output_dir, "schemas")
+    detector = SchemaDetector()
+    # No isfile pre-filter on these lists: find_schema_files returns
+    # paths from a live scandir of the same directory, so every entry
+    # existed moments ago and a second stat per schema buys nothing.
+    schemas = detector.find_schema_files(schema_output_dir)
+    openapi_wrapper = OpenAPIWrapper()
+    hub_generator = DAKApiHubGenerator()
+
+    # Each schema's processing is an independent read/build/write, so the
+    # per-kind batches map onto a thread pool; results come back in input
+    # order and are collected on the main thread.
+    # One snapshot of the schemas directory stands in for the per-schema
+    # displays/JSON-LD stat calls inside the workers.
+    try:
+        with os.scandir(schema_output_dir) as it:
+            existing_artifacts = {e.name for e in it}
+    except (FileNotFoundError, NotADirectoryError):
+        existing_artifacts = set()
+
+    schema_docs = {"valueset": [], "logical_model": []}
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for kind in ("valueset", "logical_model"):
+            if not schemas[kind]:
+                continue
+            results = executor.map(
+                functools.partial(
+                    _process_schema,
+                    kind=kind,
+                    schema_output_dir=schema_output_dir,
+                    openapi_wrapper=openapi_wrapper,
+                    existing_artifacts=existing_artifacts,
+                ),
+                schemas[kind],
+            )
+            schema_docs[kind] = docs = [entry for entry in results if entry]
+            qa_reporter.add_success(f"Processed {len(docs)} {kind} schemas")
+            if len(docs) != len(schemas[kind]):
+                qa_reporter.add_warning(
+                    f"{len(schemas[kind]) - len(docs)} {kind} schemas failed"
+                )
+
+    # The two enumeration builds are independent (disjoint output files),
+    # so they run concurrently; QA bookkeeping stays on this thread.
+    enumeration_docs = []
+    enum_kinds = [k for k in ("valueset", "logical_model") if schemas[k]]
+    if enum_kinds:
+        with ThreadPoolExecutor(max_workers=len(enum_kinds)) as executor:
+            futures = [
+                executor.submit(
+                    _build_enumeration, kind, schemas[kind],
+                    schema_output_dir, hub_generator, openapi_wrapper,
+                )
+                for kind in enum_kinds
+            ]
+        for future in futures:
+            result = future.result()
+            if result is None:
+                continue
+            enum_path, doc = result
+            enumeration_docs.append(doc)
+            qa_reporter.add_file_processed(enum_path, "created enumeration schema")
+
+    # Refresh the snapshot once now that the wrapper and enumeration
+    # writes are done, so later phases see the new artifacts; the cached
+    # directory listings are dropped for the same reason.
+    clear_fs_caches()
+    try:
+        with os.scandir(schema_output_dir) as it:
+            existing_artifacts = {e.name for e in it}
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+
+    jsonld_docs = []
+    for jsonld_path in detector.find_jsonld_files(schema_output_dir):
+        title, description = _extract_jsonld_meta(jsonld_path)
+        jsonld_docs.append({
+            "file": f"schemas/{jsonld_path.rpartition(os.sep)[2]}",
+            "title": title,
+            "description": description,
+        })
+    if jsonld_docs:
+        qa_reporter.add_success(f"Indexed {len(jsonld_docs)} JSON-LD vocabularies")
+
+    # ---- OpenAPI document collection ----
+    # Documents come from three places: authored specs under the IG's
+    # input/images/openapi, copies the publisher placed under
+    # output/images/openapi, and the wrappers written above under
+    # output/schemas. One pass per root discovers, categorizes and
+    # dedups in the same step, so overlapping trees are never walked
+    # twice and no per-path prefix classification is needed afterwards.
+    schema_doc_renderer = SchemaDocumentationRenderer()
+    scanned = _scan_openapi((
+        (os.path.join(ig_root, "input", "images", "openapi"), "authored"),
+        (os.path.join(output_dir, "images", "openapi"), "published"),
+        (schema_output_dir, "generated"),
+    ))
+    all_openapi_paths = [path for path, _, _ in scanned]
+
+    # The renders are independent read/build/write jobs, so they run on
+    # a thread pool; dedup happened above and the QA bookkeeping below
+    # stays on this thread, so the parallel region shares nothing.
+    openapi_docs = []
+    if all_openapi_paths:
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as executor:
+            results = list(executor.map(
+                functools.partial(
+                    _render_openapi_doc,
+                    output_dir=output_dir,
+                    renderer=schema_doc_renderer,
+                ),
+                all_openapi_paths,
+            ))
+        for (openapi_path, category, _), doc in zip(scanned, results):
+            if doc is None:
+                continue
+            openapi_docs.append(doc)
+            qa_reporter.add_file_processed(
+                openapi_path, f"rendered {category} OpenAPI documentation"
+            )
+    if openapi_docs:
+        qa_reporter.add_success(
+            f"Rendered {len(openapi_docs)} OpenAPI documents"
+        )
+
+    hub_content = hub_generator.generate_hub_html_content(
+        schema_docs, enumeration_docs, openapi_docs, jsonld_docs=jsonld_docs
+    )
+    post_process_dak_api_html(output_dir, hub_content, HTMLProcessor(), qa_reporter)
+
+    if not qa_reporter.save_to_file(qa_path):
+        logger.error("Could not write the QA report")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
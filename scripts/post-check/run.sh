@@ -0,0 +1,19 @@
+#!/bin/sh
+# Run the post-check pipeline, preferring PyPy when it is installed.
+#
+# The pipeline is pure-Python glue over JSON parsing and string building,
+# which is exactly where PyPy's JIT dominates CPython. The native
+# accelerators (orjson, the compiled _sd_index twin) are optional by
+# design, so under PyPy the pure-Python paths are taken automatically.
+set -e
+
+dir="$(dirname "$0")"
+
+if command -v pypy3 >/dev/null 2>&1; then
+    py=pypy3
+else
+    py=python3
+fi
+
+"$py" "$dir/00_add_resource_date_to_index.py" "$@"
+"$py" "$dir/dak_api.py" "$@"